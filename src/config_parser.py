@@ -84,6 +84,14 @@ class ConfigParser:
         """Get Zotero configuration."""
         return self.config['zotero']
     
+    def get_cache_config(self) -> Dict[str, Any]:
+        """Get score-cache configuration (optional section)."""
+        return self.config.get('cache') or {}
+    
+    def get_prefilter_config(self) -> Dict[str, Any]:
+        """Get embedding pre-filter configuration (optional section)."""
+        return self.config.get('prefilter') or {}
+    
     def get_interests(self) -> Dict[str, Any]:
         """Get user interests."""
         return self.config['interests']
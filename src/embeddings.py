@@ -0,0 +1,75 @@
+"""
+Local text embeddings for similarity lookups
+"""
+
+import re
+import zlib
+import numpy as np
+from typing import List
+
+
+# The Anthropic API has no embeddings endpoint, so papers are embedded
+# locally with signed feature hashing over word unigrams + bigrams. It
+# needs no network call or model download, and is plenty to spot
+# near-duplicate abstracts and rough topical overlap.
+EMBEDDING_DIM = 1024
+
+# Bump whenever the tokenizer/hashing changes so persisted vectors built
+# with the old scheme are never compared against new ones.
+EMBEDDING_VERSION = f"hash-v1-{EMBEDDING_DIM}"
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Very common words carry no topical signal and would otherwise pull
+# every vector toward the same direction.
+_STOPWORDS = frozenset(
+    "the and for with that this from are was were has have not but "
+    "its our their which these those into onto than then also can may "
+    "using use used based via such between over under both all each "
+    "here there been being show shows shown paper study results".split()
+)
+
+
+def _features(text: str) -> List[str]:
+    """Lowercased word unigrams and bigrams, minus stopwords."""
+    tokens = [
+        t for t in _TOKEN.findall(text.lower())
+        if len(t) > 2 and t not in _STOPWORDS
+    ]
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def embed_texts(texts: List[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Embed texts as L2-normalized hashed feature vectors.
+
+    Args:
+        texts: Texts to embed
+        dim: Vector dimensionality
+
+    Returns:
+        (len(texts), dim) float32 array; rows are unit length (or all
+        zero for texts with no usable tokens), so a dot product is the
+        cosine similarity.
+    """
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+
+    for row, text in enumerate(texts):
+        for feature in _features(text):
+            # crc32 is stable across processes (unlike hash()), so
+            # vectors can be persisted and compared between runs.
+            h = zlib.crc32(feature.encode("utf-8"))
+            out[row, h % dim] += 1.0 if h & 0x80000000 else -1.0
+
+    # Sublinear term frequency, then unit length.
+    np.copysign(np.log1p(np.abs(out)), out, out=out)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    out /= norms
+
+    return out
+
+
+def paper_text(paper: dict) -> str:
+    """The text embedded for a paper: its title and abstract."""
+    return f"{paper.get('title', '')}\n{paper.get('abstract', '')}"
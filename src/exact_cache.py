@@ -0,0 +1,100 @@
+"""
+Persistent exact-match cache for LLM relevance scores
+"""
+
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class ExactCache:
+    """
+    SQLite-backed cache keyed by a hash of the full request.
+
+    The key covers the model, the system prompt's identity and the
+    per-paper message, so a hit needs an identical paper message under
+    the same instructions, library and interests (and a model or
+    prompt change never reuses a stale score).
+
+    Rows are tagged with a namespace per (model, context); rows from
+    other namespaces can never hit again and are deleted on open, so
+    the database holds only the current library's scores.
+    """
+
+    def __init__(self, cache_dir: str, model: str, context: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            model: Model whose scores are cached
+            context: Stable identity of the system prompt (see
+                LLMEvaluator._cache_context)
+        """
+        self._namespace = hashlib.sha256(
+            f"{model}|{context}".encode("utf-8")
+        ).hexdigest()[:16]
+
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path / "exact.sqlite3")
+
+        # Databases written before namespacing can't be pruned; start
+        # them over.
+        columns = {
+            row[1] for row in
+            self._conn.execute("PRAGMA table_info(scores)")
+        }
+        if columns and "namespace" not in columns:
+            self._conn.execute("DROP TABLE scores")
+
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key TEXT PRIMARY KEY, score REAL NOT NULL, reason TEXT, "
+            "namespace TEXT NOT NULL)"
+        )
+        self._remove_stale()
+
+    @staticmethod
+    def make_key(model: str, context: str, prompt: str) -> str:
+        """
+        Hash the parts of a request that determine its result.
+
+        Args:
+            model: Model used for scoring
+            context: Stable identity of the system prompt (see
+                LLMEvaluator._cache_context), not its shuffled text
+            prompt: Per-paper user message
+        """
+        return hashlib.sha256(
+            f"{model}|{context}|{prompt}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached {'score', 'reason'} for key, if any."""
+        row = self._conn.execute(
+            "SELECT score, reason FROM scores WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'score': row[0], 'reason': row[1]}
+
+    def put(self, key: str, score: float, reason: str) -> None:
+        """Store a score (committed on close)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+            (key, score, reason, self._namespace)
+        )
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def _remove_stale(self) -> None:
+        """Delete rows from other namespaces (old model/context)."""
+        self._conn.execute(
+            "DELETE FROM scores WHERE namespace != ?", (self._namespace,)
+        )
+        self._conn.commit()
@@ -2,13 +2,31 @@
 LLM-based paper relevance evaluator using the Anthropic (Claude) API
 """
 
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+from anthropic import DEFAULT_CONNECTION_LIMITS
 from anthropic import AuthenticationError, PermissionDeniedError, RateLimitError
-from typing import Dict, Any, List, Tuple
+from anthropic import APIConnectionError
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import time
+from tqdm.contrib.logging import logging_redirect_tqdm
+import asyncio
+import hashlib
+import heapq
+import importlib.util
+import json
+import logging
+import numpy as np
+import operator
+import random
 
+from embeddings import embed_texts, paper_text
+from exact_cache import ExactCache
+from rate_limiter import TokenBucket
+from semantic_cache import DEFAULT_SIMILARITY_THRESHOLD, SemanticCache
+
+
+logger = logging.getLogger(__name__)
 
 # Errors that mean the whole run is broken (bad/deactivated API key,
 # revoked permissions). These must abort the digest, not be swallowed
@@ -19,6 +37,63 @@ FATAL_API_ERRORS = (AuthenticationError, PermissionDeniedError)
 # relevance scoring.
 DEFAULT_MODEL = "claude-haiku-4-5"
 
+# Retry policy. Rate limits honour the server's retry-after / reset
+# headers and otherwise back off exponentially up to the cap; dropped
+# connections and timeouts are usually brief, so they get a shorter cap.
+RATE_LIMIT_BACKOFF_CAP = 60.0
+CONNECTION_BACKOFF_CAP = 10.0
+
+# Headers Anthropic sends with a 429. retry-after is in seconds; the
+# *-reset headers are RFC 3339 timestamps of when the limit refills.
+_RESET_HEADERS = (
+    "anthropic-ratelimit-requests-reset",
+    "anthropic-ratelimit-tokens-reset",
+    "anthropic-ratelimit-input-tokens-reset",
+    "anthropic-ratelimit-output-tokens-reset",
+)
+
+# Embedding pre-filter band (cosine similarity to the Zotero library
+# centroid). Only papers inside [low, high] are sent to the LLM. The
+# defaults are deliberately wide: hashed-vocabulary similarity is a
+# coarse signal, so only papers with almost no overlap are skipped and
+# only near-verbatim topical matches skip the LLM.
+DEFAULT_PREFILTER_LOW = 0.05
+DEFAULT_PREFILTER_HIGH = 0.6
+
+# Output budget per scoring call (a score + one-sentence reason). Also
+# what each call is charged against the output-tokens-per-minute limit.
+MAX_OUTPUT_TOKENS = 256
+
+# Prompt size caps. Input tokens drive both cost and latency, and an
+# abstract's first ~400 tokens carry the signal needed for a relevance
+# score. The research context is sent with every request (cached, but
+# still billed at the cache-read rate), so cap it too; get_summary puts
+# the detailed papers first, so only trailing titles are cut.
+MAX_ABSTRACT_CHARS = 1500
+MAX_CONTEXT_CHARS = 200_000
+TRUNCATION_MARKER = " …[truncated]"
+
+# Per-request HTTP timeout (seconds). The SDK's HTTP client applies it
+# to each connect/read/write step, not the whole request.
+HTTP_TIMEOUT = 60.0
+
+# Message Batches API polling. Batches usually finish well within an
+# hour; back off exponentially between polls up to the cap, and give up
+# (cancel + fall back to online scoring) after the max wait so a stuck
+# batch can't hang a scheduled run.
+BATCH_POLL_INITIAL = 10.0
+BATCH_POLL_MAX = 300.0
+DEFAULT_BATCH_MAX_WAIT = 2 * 3600.0
+
+# Batch submission limits. The API caps a batch at 256 MB and 100,000
+# requests; each request repeats the full system prompt, so large runs
+# are split across several batches. The byte budget is kept well under
+# the cap (JSON framing, estimate slack) and bounds the memory held for
+# one submission.
+BATCH_MAX_BYTES = 64 * 1024 * 1024
+BATCH_MAX_REQUESTS = 100_000
+BATCH_REQUEST_OVERHEAD = 512
+
 # Structured-output tool. Forcing the model to call this eliminates the
 # regex parsing that previously turned any unparseable response into a
 # silent score of 0.0 (i.e. a dropped paper).
@@ -33,6 +108,8 @@ RELEVANCE_TOOL = {
         "properties": {
             "score": {
                 "type": "number",
+                "minimum": 0,
+                "maximum": 10,
                 "description": (
                     "Relevance on a 0-10 scale. 0-3: not relevant, "
                     "4-6: somewhat relevant, 7-8: relevant, "
@@ -45,10 +122,45 @@ RELEVANCE_TOOL = {
             },
         },
         "required": ["score", "reason"],
+        "additionalProperties": False,
     },
 }
 
 
+def _server_retry_delay(error: RateLimitError) -> float:
+    """
+    Seconds the server asked us to wait before retrying (0 if unknown).
+
+    Uses retry-after when present, else the latest rate-limit reset
+    timestamp.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return 0.0
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+    now = datetime.now(timezone.utc)
+    delay = 0.0
+    for name in _RESET_HEADERS:
+        value = headers.get(name)
+        if not value:
+            continue
+        try:
+            reset = datetime.fromisoformat(value)
+        except ValueError:
+            continue
+        if reset.tzinfo is None:
+            reset = reset.replace(tzinfo=timezone.utc)
+        delay = max(delay, (reset - now).total_seconds())
+    return delay
+
+
 class FatalEvaluationError(RuntimeError):
     """Raised when the LLM cannot be reached at all (e.g. invalid key)."""
 
@@ -62,7 +174,15 @@ class LLMEvaluator:
         model: str = DEFAULT_MODEL,
         threshold: float = 7.0,
         max_workers: int = 10,
-        verbose: bool = False
+        use_batch_api: bool = False,
+        batch_threshold: int = 1000,
+        batch_max_wait: float = DEFAULT_BATCH_MAX_WAIT,
+        cache_dir: Optional[str] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        requests_per_minute: Optional[float] = None,
+        output_tokens_per_minute: Optional[float] = None,
+        prefilter_low: float = DEFAULT_PREFILTER_LOW,
+        prefilter_high: float = DEFAULT_PREFILTER_HIGH
     ):
         """
         Initialize the LLM evaluator.
@@ -71,10 +191,45 @@ class LLMEvaluator:
             api_key: Anthropic API key
             model: Claude model to use (e.g. claude-haiku-4-5)
             threshold: Minimum score for relevance (0-10)
-            max_workers: Max parallel API calls
-            verbose: Show sample LLM responses
+            max_workers: Max concurrent in-flight API calls
+            use_batch_api: Score large runs through the Message Batches
+                API (half the token price, separate rate-limit pool)
+            batch_threshold: Minimum number of papers before the batch
+                path is used; smaller runs stay on the online path
+            batch_max_wait: Seconds to wait for a batch before
+                cancelling it and scoring the rest online
+            cache_dir: Directory for the persistent score caches (exact
+                and semantic); None disables caching
+            similarity_threshold: Cosine similarity above which a
+                previously scored paper's result is reused
+            requests_per_minute: Shared cap on online API calls per
+                minute across all workers; None/0 disables it
+            output_tokens_per_minute: Shared cap on output tokens per
+                minute (each call reserves MAX_OUTPUT_TOKENS); None/0
+                disables it
+            prefilter_low: With a corpus centroid, papers less similar
+                than this to the library are skipped without an LLM call
+            prefilter_high: With a corpus centroid, papers more similar
+                than this are accepted without an LLM call
         """
-        self.client = Anthropic(api_key=api_key)
+        # One async client (and so one pooled HTTP connection set) is
+        # shared by every request in the run. Size the pool so every
+        # in-flight request (plus retries) keeps a warm keep-alive
+        # connection instead of paying a fresh TLS handshake; use HTTP/2
+        # multiplexing when the optional 'h2' package is installed.
+        pool_size = 2 * max_workers
+        self._http = DefaultAsyncHttpxClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            # Build the limits with the same HTTP library the SDK's client
+            # uses (its default limits object's class), rather than
+            # depending on that library directly.
+            limits=type(DEFAULT_CONNECTION_LIMITS)(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size
+            ),
+            timeout=HTTP_TIMEOUT
+        )
+        self.client = AsyncAnthropic(api_key=api_key, http_client=self._http)
 
         # Guard against a stale/non-Claude model string (e.g. an
         # OpenAI 'gpt-4o' left over in config) being sent to the
@@ -88,10 +243,31 @@ class LLMEvaluator:
         self.model = model
         self.threshold = threshold
         self.max_workers = max_workers
-        self.verbose = verbose
         self.sample_count = 0
+        self.use_batch_api = use_batch_api
+        self.batch_threshold = batch_threshold
+        self.batch_max_wait = batch_max_wait
+        self.cache_dir = cache_dir
+        self.similarity_threshold = similarity_threshold
+        self.prefilter_low = prefilter_low
+        self.prefilter_high = prefilter_high
 
-    def validate_credentials(self) -> None:
+        # Rate limiters gate every online call so the workers together
+        # stay under the account's limits instead of triggering 429s.
+        self._request_limiter = (
+            TokenBucket.per_minute(requests_per_minute)
+            if requests_per_minute else None
+        )
+        self._output_token_limiter = (
+            TokenBucket.per_minute(output_tokens_per_minute)
+            if output_tokens_per_minute else None
+        )
+
+    async def aclose(self) -> None:
+        """Close the client and its shared connection pool."""
+        await self.client.close()
+
+    async def validate_credentials(self) -> None:
         """
         Make one tiny call to confirm the API key works.
 
@@ -100,7 +276,7 @@ class LLMEvaluator:
                 permissions were revoked. This aborts the whole run.
         """
         try:
-            self.client.messages.create(
+            await self.client.messages.create(
                 model=self.model,
                 max_tokens=1,
                 messages=[{"role": "user", "content": "ping"}],
@@ -131,11 +307,12 @@ class LLMEvaluator:
             {
                 "type": "text",
                 "text": (
-                    "You are an academic research assistant. Evaluate "
-                    "how relevant each arXiv paper is to the user's "
-                    "research background and current interests, then "
-                    "call the record_relevance tool with a 0-10 score "
-                    "and a one-sentence reason."
+                    "You are an academic research assistant. Each user "
+                    "message is a new arXiv paper (title and abstract). "
+                    "Evaluate how relevant it is to the user's research "
+                    "background and current interests below, then call "
+                    "the record_relevance tool with a 0-10 score and a "
+                    "one-sentence reason."
                 ),
             },
             {
@@ -148,19 +325,35 @@ class LLMEvaluator:
             },
         ]
 
-    def evaluate_papers(
+    async def evaluate_papers(
         self,
         papers: List[Dict[str, Any]],
         research_context: str,
-        user_interests: str
+        user_interests: str,
+        corpus_centroid: Optional[np.ndarray] = None,
+        top_k: Optional[int] = None,
+        context_fingerprint: Optional[str] = None
     ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Evaluate multiple papers for relevance in parallel.
+        Evaluate multiple papers for relevance concurrently.
+
+        All requests share one event loop, with at most max_workers in
+        flight at a time.
 
         Args:
             papers: List of paper dictionaries
             research_context: Summary from Zotero library
             user_interests: User's interest description
+            corpus_centroid: Optional mean embedding of the Zotero
+                library. When given, papers far from it are skipped and
+                papers very close to it are auto-accepted, so only the
+                ambiguous band is scored by the LLM.
+            top_k: Keep only the top_k highest-scoring relevant papers;
+                None keeps all of them
+            context_fingerprint: Order-independent identity of
+                research_context, used for cache keys instead of its
+                text (which changes every run when the library is
+                shuffled). None keys on the literal text.
 
         Returns:
             (relevant_papers, unscored_papers). unscored_papers are
@@ -170,74 +363,552 @@ class LLMEvaluator:
         """
         # Fail fast on a broken key instead of silently emailing an
         # empty digest after every paper errors out.
-        self.validate_credentials()
+        await self.validate_credentials()
+
+        # Score each distinct paper once (cross-lists, merged feeds).
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for paper in papers:
+            groups.setdefault(self._dedup_key(paper), []).append(paper)
+        unique = [group[0] for group in groups.values()]
+        if len(unique) < len(papers):
+            print(
+                f"  Scoring {len(unique)} unique paper(s) "
+                f"({len(papers) - len(unique)} duplicate(s) share scores)"
+            )
+
+        if len(research_context) > MAX_CONTEXT_CHARS:
+            print(
+                f"  Research context truncated from "
+                f"{len(research_context)} to {MAX_CONTEXT_CHARS} chars"
+            )
+            research_context = (
+                research_context[:MAX_CONTEXT_CHARS] + TRUNCATION_MARKER
+            )
+
+        long_abstracts = sum(
+            len(p['abstract']) > MAX_ABSTRACT_CHARS for p in unique
+        )
+        if long_abstracts:
+            print(
+                f"  Truncating {long_abstracts} abstract(s) to "
+                f"{MAX_ABSTRACT_CHARS} chars"
+            )
 
         system_blocks = self._build_system_blocks(
             research_context, user_interests
         )
 
+        # Embed every paper in one pass; shared by the pre-filter and
+        # the semantic cache.
+        vectors = None
+        if unique and (self.cache_dir or corpus_centroid is not None):
+            vectors = embed_texts([paper_text(p) for p in unique])
+
+        results: List[Any] = [None] * len(unique)
+        to_score = list(range(len(unique)))
+        if corpus_centroid is not None and unique:
+            to_score = self._prefilter(vectors, corpus_centroid, results)
+
+        scored = await self._score_papers(
+            [unique[i] for i in to_score],
+            system_blocks,
+            self._cache_context(
+                system_blocks, user_interests, context_fingerprint
+            ),
+            vectors[to_score] if vectors is not None else None
+        )
+        for i, result in zip(to_score, scored):
+            results[i] = result
+
         relevant_papers = []
         unscored_papers = []
 
-        # Parallel evaluation with progress bar
-        with ThreadPoolExecutor(
-            max_workers=self.max_workers
-        ) as executor:
-            # Submit all evaluation tasks
-            future_to_paper = {
-                executor.submit(
-                    self._evaluate_single_paper,
-                    paper,
-                    system_blocks
-                ): paper
-                for paper in papers
-            }
+        # Fan each result back out to every copy of the paper.
+        for group, result in zip(groups.values(), results):
+            for paper in group:
+                if isinstance(result, FatalEvaluationError):
+                    # Key died mid-run — abort instead of continuing to a
+                    # silently empty digest.
+                    raise result
+                if isinstance(result, BaseException):
+                    # Unexpected failure in our own handling — treat as
+                    # unscored rather than losing the paper.
+                    logger.warning(
+                        "Error processing paper '%s...': %s",
+                        paper['title'][:50], result
+                    )
+                    paper['eval_error'] = f"Processing error: {result}"
+                    unscored_papers.append(paper)
+                elif result['status'] == 'failed':
+                    # Could not evaluate — keep it, don't drop it.
+                    paper['eval_error'] = result['reason']
+                    unscored_papers.append(paper)
+                elif result['status'] == 'skipped':
+                    # Pre-filter: too far from the library to matter.
+                    continue
+                elif (
+                    result['status'] == 'auto'
+                    or result['score'] >= self.threshold
+                ):
+                    paper['relevance_score'] = result['score']
+                    paper['relevance_reason'] = result['reason']
+                    relevant_papers.append(paper)
+                # else: genuinely below threshold — dropped.
+
+        # Sort by relevance score (highest first). With a top_k, a
+        # bounded heap is O(N log K) instead of a full sort.
+        by_score = operator.itemgetter('relevance_score')
+        if top_k is not None and top_k < len(relevant_papers):
+            print(
+                f"  Keeping top {top_k} of {len(relevant_papers)} "
+                f"relevant papers"
+            )
+            relevant_papers = heapq.nlargest(
+                top_k, relevant_papers, key=by_score
+            )
+        else:
+            relevant_papers.sort(key=by_score, reverse=True)
+
+        return relevant_papers, unscored_papers
+
+    def _prefilter(
+        self,
+        vectors: np.ndarray,
+        corpus_centroid: np.ndarray,
+        results: List[Any]
+    ) -> List[int]:
+        """
+        Settle clear-cut papers by similarity to the library centroid.
+
+        Papers below prefilter_low get a 'skipped' result and papers
+        above prefilter_high an 'auto' (accepted) result, scored
+        10 * similarity but at least the relevance threshold, written
+        into results in place.
+
+        Returns:
+            Indices of the papers in the ambiguous band, which still
+            need an LLM score.
+        """
+        norm = float(np.linalg.norm(corpus_centroid))
+        if norm == 0:
+            return list(range(len(results)))
+
+        sims = vectors @ (corpus_centroid / norm).astype(np.float32)
+        to_score = []
+        for i, sim in enumerate(sims):
+            if sim < self.prefilter_low:
+                results[i] = {
+                    'status': 'skipped',
+                    'score': 0.0,
+                    'reason': f'Similarity {sim:.2f} to library',
+                }
+            elif sim > self.prefilter_high:
+                # Auto-accepted papers are in the digest by definition,
+                # so never show them below the relevance threshold.
+                results[i] = {
+                    'status': 'auto',
+                    'score': max(
+                        float(self.threshold), round(10.0 * float(sim), 1)
+                    ),
+                    'reason': (
+                        f"Auto-accepted: similarity {sim:.2f} to your "
+                        "Zotero library (not LLM-scored)"
+                    ),
+                }
+            else:
+                to_score.append(i)
+
+        skipped = sum(
+            1 for r in results if r is not None and r['status'] == 'skipped'
+        )
+        accepted = len(results) - len(to_score) - skipped
+        print(
+            f"  Pre-filter: {skipped} skipped, {accepted} auto-accepted, "
+            f"{len(to_score)} sent to the LLM"
+        )
+        return to_score
+
+    async def _score_papers(
+        self,
+        papers: List[Dict[str, Any]],
+        system_blocks: List[Dict[str, Any]],
+        cache_context: str,
+        vectors: Optional[np.ndarray] = None
+    ) -> List[Any]:
+        """
+        Score papers, reusing cached scores where possible.
+
+        Args:
+            papers: Papers to score
+            system_blocks: Cached system prompt blocks
+            cache_context: Stable identity of the system prompt, used
+                to namespace cached scores
+            vectors: Embeddings of papers (required for the semantic
+                cache; computed here if omitted)
+
+        Returns:
+            One result dict (or raised exception) per paper, in order.
+        """
+        results: List[Any] = [None] * len(papers)
+        pending = list(range(len(papers)))
+
+        exact = semantic = None
+        if self.cache_dir and papers:
+            exact = ExactCache(self.cache_dir, self.model, cache_context)
+            semantic = SemanticCache(
+                self.cache_dir,
+                self.model,
+                cache_context,
+                threshold=self.similarity_threshold
+            )
+            keys = [
+                ExactCache.make_key(
+                    self.model, cache_context, self._build_prompt(p)
+                )
+                for p in papers
+            ]
+            if vectors is None:
+                vectors = embed_texts([paper_text(p) for p in papers])
+
+            pending = []
+            for i in range(len(papers)):
+                hit = exact.get(keys[i]) or semantic.lookup(vectors[i])
+                if hit is None:
+                    pending.append(i)
+                else:
+                    results[i] = {'status': 'ok', **hit}
+            if len(pending) < len(papers):
+                print(
+                    f"  Reusing cached scores for "
+                    f"{len(papers) - len(pending)} paper(s)"
+                )
+
+        to_score = [papers[i] for i in pending]
+        try:
+            if not to_score:
+                scored = []
+            elif self.use_batch_api and len(to_score) >= self.batch_threshold:
+                scored = await self._evaluate_batch(to_score, system_blocks)
+            else:
+                scored = await self._evaluate_online(to_score, system_blocks)
+
+            for i, result in zip(pending, scored):
+                results[i] = result
+                if (
+                    exact is not None
+                    and isinstance(result, dict)
+                    and result['status'] == 'ok'
+                ):
+                    exact.put(keys[i], result['score'], result['reason'])
+                    semantic.add(
+                        vectors[i], result['score'], result['reason']
+                    )
+        finally:
+            if exact is not None:
+                exact.close()
+                semantic.save()
+
+        return results
+
+    @staticmethod
+    def _dedup_key(paper: Dict[str, Any]) -> str:
+        """Identity of a paper: arXiv id, DOI, or a content hash."""
+        return (
+            paper.get('arxiv_id')
+            or paper.get('doi')
+            or hashlib.sha256(
+                f"{paper['title']}\n{paper['abstract']}".encode("utf-8")
+            ).hexdigest()
+        )
+
+    def _system_text(self, system_blocks: List[Dict[str, Any]]) -> str:
+        """Flatten the system prompt blocks into one string."""
+        return "\n".join(block["text"] for block in system_blocks)
+
+    def _cache_context(
+        self,
+        system_blocks: List[Dict[str, Any]],
+        user_interests: str,
+        context_fingerprint: Optional[str]
+    ) -> str:
+        """
+        Stable identity of the system prompt for cache keys.
+
+        With a shuffled library the research context text differs on
+        every run, so when a fingerprint of it is available, key on the
+        instructions + fingerprint + interests instead.
+        """
+        if context_fingerprint is None:
+            return self._system_text(system_blocks)
+        return "\n".join(
+            [system_blocks[0]["text"], context_fingerprint, user_interests]
+        )
+
+    async def _evaluate_online(
+        self,
+        papers: List[Dict[str, Any]],
+        system_blocks: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Score papers through the regular Messages endpoint.
+
+        Returns:
+            One result dict (or raised exception) per paper, in order.
+        """
+        results: List[Any] = [None] * len(papers)
+        if not papers:
+            return results
+
+        # Stream papers through a bounded set of in-flight tasks rather
+        # than creating one task per paper up front: memory stays
+        # constant in the corpus size and the first results come back
+        # as soon as the first requests do.
+        pending = iter(enumerate(papers))
+        inflight = {}
 
-            # Process completed tasks with progress bar
-            with tqdm(
-                total=len(papers),
-                desc="Evaluating papers",
-                unit="paper"
-            ) as pbar:
-                for future in as_completed(future_to_paper):
-                    paper = future_to_paper[future]
-                    try:
-                        result = future.result()
-
-                        if result['status'] == 'failed':
-                            # Could not evaluate — keep it, don't drop it.
-                            paper['eval_error'] = result['reason']
-                            unscored_papers.append(paper)
-                        elif result['score'] >= self.threshold:
-                            paper['relevance_score'] = result['score']
-                            paper['relevance_reason'] = result['reason']
-                            relevant_papers.append(paper)
-                        # else: genuinely below threshold — dropped.
-                    except FatalEvaluationError:
-                        # Key died mid-run — abort instead of
-                        # continuing to a silently empty digest.
-                        raise
-                    except Exception as e:
-                        # Unexpected failure in our own handling — treat
-                        # as unscored rather than losing the paper.
-                        print(
-                            f"\nError processing paper "
-                            f"'{paper['title'][:50]}...': {e}"
+        def submit_next() -> bool:
+            item = next(pending, None)
+            if item is None:
+                return False
+            index, paper = item
+            task = asyncio.ensure_future(
+                self._evaluate_single_paper(paper, system_blocks)
+            )
+            inflight[task] = index
+            return True
+
+        # Route log records through tqdm.write so warnings print above
+        # the progress bar instead of splicing into it.
+        with logging_redirect_tqdm(), tqdm(
+            total=len(papers),
+            desc="Evaluating papers",
+            unit="paper"
+        ) as pbar:
+            while len(inflight) < self.max_workers and submit_next():
+                pass
+
+            try:
+                while inflight:
+                    done, _ = await asyncio.wait(
+                        inflight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        index = inflight.pop(task)
+                        error = task.exception()
+                        if isinstance(error, FatalEvaluationError):
+                            # Key died mid-run — no point finishing.
+                            raise error
+                        results[index] = (
+                            error if error is not None else task.result()
                         )
-                        paper['eval_error'] = f"Processing error: {e}"
-                        unscored_papers.append(paper)
-                    finally:
                         pbar.update(1)
+                        submit_next()
+            finally:
+                for task in inflight:
+                    task.cancel()
 
-        # Sort by relevance score (highest first)
-        relevant_papers.sort(
-            key=lambda x: x['relevance_score'],
-            reverse=True
-        )
+        return results
 
-        return relevant_papers, unscored_papers
+    async def _evaluate_batch(
+        self,
+        papers: List[Dict[str, Any]],
+        system_blocks: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """
+        Score papers through the Message Batches API.
+
+        Papers are split across as many batches as the size limits
+        require. Papers whose batch request errored, expired or was
+        cancelled (or whose whole batch could not be submitted or did
+        not finish within batch_max_wait) are re-scored on the online
+        path, so nothing is lost to a bad batch.
 
-    def _evaluate_single_paper(
+        Returns:
+            One result dict (or raised exception) per paper, in order.
+        """
+        results: List[Any] = [None] * len(papers)
+        submitted: List[str] = []
+
+        try:
+            # Every request repeats the full system prompt, so one batch
+            # for the whole run could exceed the per-batch size limit.
+            # Submit in chunks, building each chunk's requests only when
+            # it is sent so just one chunk is held in memory.
+            for chunk in self._batch_chunks(papers, system_blocks):
+                try:
+                    batch = await self.client.messages.batches.create(
+                        requests=[
+                            {
+                                # custom_id must be unique and match
+                                # [a-zA-Z0-9_-]{1,64}, so use the
+                                # position rather than the arXiv id.
+                                'custom_id': f"paper-{i}",
+                                'params': self._request_params(
+                                    papers[i], system_blocks
+                                ),
+                            }
+                            for i in chunk
+                        ]
+                    )
+                except FATAL_API_ERRORS:
+                    raise
+                except Exception as e:
+                    print(
+                        f"  Warning: batch submission failed ({e}); "
+                        "scoring the remaining papers online."
+                    )
+                    break
+                submitted.append(batch.id)
+                print(
+                    f"  Submitted batch {batch.id} "
+                    f"({len(chunk)} papers)"
+                )
+
+            if submitted:
+                print("  Waiting for batch results...")
+            pending = set(submitted)
+            delay = BATCH_POLL_INITIAL
+            waited = 0.0
+            while pending:
+                if waited >= self.batch_max_wait:
+                    print(
+                        f"  Warning: {len(pending)} batch(es) not "
+                        f"finished after {waited:.0f}s; cancelling and "
+                        "scoring the remaining papers online."
+                    )
+                    await self._cancel_batches(pending)
+                    break
+                await asyncio.sleep(delay)
+                waited += delay
+                delay = min(delay * 2, BATCH_POLL_MAX)
+
+                for batch_id in sorted(pending):
+                    batch = await self.client.messages.batches.retrieve(
+                        batch_id
+                    )
+                    if batch.processing_status == "ended":
+                        pending.discard(batch_id)
+                        await self._collect_batch_results(
+                            batch_id, results
+                        )
+        except FATAL_API_ERRORS as e:
+            await self._cancel_batches(submitted)
+            raise FatalEvaluationError(
+                "Anthropic API key rejected during batch submission — "
+                "the key is invalid, deactivated, or lacks "
+                f"permission. (Original error: {e})"
+            ) from e
+        except Exception as e:
+            # Don't leave batches running (and billing) while the same
+            # papers are re-scored online.
+            await self._cancel_batches(submitted)
+            print(
+                f"  Warning: batch evaluation failed ({e}); "
+                "scoring papers online instead."
+            )
+
+        # Fall back to the online path for anything the batch missed.
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            if len(missing) < len(papers):
+                print(
+                    f"  {len(missing)} paper(s) not scored by the batch; "
+                    "retrying online."
+                )
+            retried = await self._evaluate_online(
+                [papers[i] for i in missing], system_blocks
+            )
+            for i, result in zip(missing, retried):
+                results[i] = result
+
+        return results
+
+    def _batch_chunks(
+        self,
+        papers: List[Dict[str, Any]],
+        system_blocks: List[Dict[str, Any]]
+    ) -> Iterator[List[int]]:
+        """
+        Split paper indices into batches under the size/count limits.
+
+        Sizes are estimated from the serialized shared request body
+        (system prompt + tool) plus each paper's own message, so the
+        large system prompt is only serialized once.
+        """
+        shared = len(json.dumps({
+            'system': system_blocks,
+            'tools': [RELEVANCE_TOOL],
+        }).encode("utf-8")) + BATCH_REQUEST_OVERHEAD
+
+        chunk: List[int] = []
+        chunk_bytes = 0
+        for i, paper in enumerate(papers):
+            size = shared + len(
+                json.dumps(self._build_prompt(paper)).encode("utf-8")
+            )
+            if chunk and (
+                chunk_bytes + size > BATCH_MAX_BYTES
+                or len(chunk) >= BATCH_MAX_REQUESTS
+            ):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+            chunk.append(i)
+            chunk_bytes += size
+        if chunk:
+            yield chunk
+
+    async def _collect_batch_results(
+        self,
+        batch_id: str,
+        results: List[Any]
+    ) -> None:
+        """Store every successfully parsed result of an ended batch."""
+        decoder = await self.client.messages.batches.results(batch_id)
+        async for entry in decoder:
+            if entry.result.type != "succeeded":
+                continue
+            index = int(entry.custom_id.split("-", 1)[1])
+            try:
+                score, reason = self._extract_tool_result(
+                    entry.result.message
+                )
+            except ValueError:
+                continue
+            results[index] = {
+                'status': 'ok',
+                'score': score,
+                'reason': reason,
+            }
+
+    async def _cancel_batches(self, batch_ids) -> None:
+        """Best-effort cancel; a batch that already ended is fine."""
+        for batch_id in list(batch_ids):
+            try:
+                await self.client.messages.batches.cancel(batch_id)
+            except Exception:
+                pass
+
+    def _request_params(
+        self,
+        paper: Dict[str, Any],
+        system_blocks: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the Messages API arguments for one paper."""
+        return {
+            'model': self.model,
+            'max_tokens': MAX_OUTPUT_TOKENS,
+            'system': system_blocks,
+            'tools': [RELEVANCE_TOOL],
+            'tool_choice': {
+                'type': 'tool',
+                'name': 'record_relevance',
+            },
+            'messages': [
+                {'role': 'user', 'content': self._build_prompt(paper)}
+            ],
+        }
+
+    async def _evaluate_single_paper(
         self,
         paper: Dict[str, Any],
         system_blocks: List[Dict[str, Any]]
@@ -254,38 +925,36 @@ class LLMEvaluator:
             'reason'. A 'failed' status means the paper could not be
             evaluated and should be surfaced as unscored, NOT scored 0.
         """
-        prompt = self._build_prompt(paper)
+        params = self._request_params(paper, system_blocks)
 
-        # Retry logic for rate limits (the SDK also retries internally,
-        # this adds extra headroom for long parallel runs).
+        # Retry logic for rate limits and dropped connections (the SDK
+        # also retries internally, this adds extra headroom for long
+        # parallel runs).
         max_retries = 5
         base_delay = 1.0
 
         for attempt in range(max_retries):
             try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=256,
-                    system=system_blocks,
-                    tools=[RELEVANCE_TOOL],
-                    tool_choice={
-                        "type": "tool",
-                        "name": "record_relevance",
-                    },
-                    messages=[{"role": "user", "content": prompt}],
-                )
+                if self._request_limiter is not None:
+                    await self._request_limiter.acquire()
+                if self._output_token_limiter is not None:
+                    await self._output_token_limiter.acquire(
+                        MAX_OUTPUT_TOKENS
+                    )
+                response = await self.client.messages.create(**params)
 
                 score, reason = self._extract_tool_result(response)
 
-                if self.verbose and self.sample_count < 3:
+                if (
+                    self.sample_count < 3
+                    and logger.isEnabledFor(logging.DEBUG)
+                ):
                     self.sample_count += 1
-                    print(
-                        f"\n{'='*60}\n"
-                        f"Sample Response {self.sample_count}:\n"
-                        f"Paper: {paper['title'][:50]}...\n"
-                        f"Parsed Score: {score}\n"
-                        f"Parsed Reason: {reason}\n"
-                        f"{'='*60}\n"
+                    logger.debug(
+                        "\n%s\nSample Response %d:\nPaper: %s...\n"
+                        "Parsed Score: %s\nParsed Reason: %s\n%s\n",
+                        "=" * 60, self.sample_count, paper['title'][:50],
+                        score, reason, "=" * 60
                     )
 
                 return {
@@ -302,13 +971,16 @@ class LLMEvaluator:
                     "the key is invalid, deactivated, or lacks "
                     f"permission. (Original error: {e})"
                 ) from e
-            except RateLimitError:
+            except RateLimitError as e:
                 if attempt < max_retries - 1:
-                    # Exponential backoff with jitter
-                    import random
-                    delay = base_delay * (2 ** attempt)
-                    delay += random.uniform(0, 1)
-                    time.sleep(delay)
+                    delay = max(
+                        _server_retry_delay(e),
+                        min(
+                            base_delay * (2 ** attempt),
+                            RATE_LIMIT_BACKOFF_CAP
+                        )
+                    )
+                    await asyncio.sleep(delay + random.uniform(0, 0.5))
                     continue
                 # Exhausted retries — mark unscored, do NOT drop.
                 return {
@@ -316,12 +988,26 @@ class LLMEvaluator:
                     'score': 0.0,
                     'reason': 'Rate limit exceeded after retries',
                 }
+            except APIConnectionError as e:
+                # Includes APITimeoutError.
+                if attempt < max_retries - 1:
+                    delay = min(
+                        base_delay * (2 ** attempt),
+                        CONNECTION_BACKOFF_CAP
+                    )
+                    await asyncio.sleep(delay + random.uniform(0, 0.5))
+                    continue
+                return {
+                    'status': 'failed',
+                    'score': 0.0,
+                    'reason': f'Connection error after retries: {e}',
+                }
             except Exception as e:
                 # Other transient/per-paper errors — mark unscored so a
                 # possibly relevant paper is surfaced, not silently lost.
-                print(
-                    f"Error evaluating paper "
-                    f"'{paper['title'][:50]}...': {e}"
+                logger.warning(
+                    "Error evaluating paper '%s...': %s",
+                    paper['title'][:50], e
                 )
                 return {
                     'status': 'failed',
@@ -360,11 +1046,18 @@ class LLMEvaluator:
         raise ValueError("Model did not return a record_relevance call")
 
     def _build_prompt(self, paper: Dict[str, Any]) -> str:
-        """Build the per-paper user message."""
+        """
+        Build the per-paper user message.
+
+        Only the paper itself goes here; all instructions live in the
+        (cached) system prompt, so each request sends and bills just the
+        title and abstract on top of the shared prefix.
+        """
+        abstract = paper['abstract']
+        if len(abstract) > MAX_ABSTRACT_CHARS:
+            abstract = abstract[:MAX_ABSTRACT_CHARS] + TRUNCATION_MARKER
+
         return (
-            "Evaluate the relevance of this new arXiv paper to the "
-            "research background and interests above, then call "
-            "record_relevance.\n\n"
             f"Title: {paper['title']}\n"
-            f"Abstract: {paper['abstract']}"
+            f"Abstract: {abstract}"
         )
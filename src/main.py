@@ -2,6 +2,9 @@
 Main orchestrator for the ArXiv Weekly Digest system
 """
 
+import argparse
+import asyncio
+import logging
 import sys
 from pathlib import Path
 
@@ -12,12 +15,13 @@ from llm_evaluator import LLMEvaluator, FatalEvaluationError
 from email_sender import EmailSender
 
 
-def main(config_path: str = "config.yaml"):
+def main(config_path: str = "config.yaml", use_cache: bool = True):
     """
     Run the weekly arxiv digest workflow.
     
     Args:
         config_path: Path to configuration file
+        use_cache: Reuse/record LLM scores in the score cache
     """
     print("=" * 70)
     print("ArXiv Weekly Digest - Starting...")
@@ -36,6 +40,9 @@ def main(config_path: str = "config.yaml"):
     print("Parsing Zotero library...")
     zotero_config = config.get_zotero_config()
     library_file = zotero_config.get('library_file', '')
+    prefilter_config = config.get_prefilter_config()
+    corpus_centroid = None
+    context_fingerprint = None
     
     if library_file and Path(library_file).exists():
         zotero = ZoteroParser(
@@ -51,6 +58,10 @@ def main(config_path: str = "config.yaml"):
             include_all_titles=include_all,
             detailed_papers=detailed
         )
+        # Stable cache identity for the (shuffled) research context.
+        context_fingerprint = (
+            f"{zotero.fingerprint()}|{include_all}|{detailed}"
+        )
         print(
             f"  Found {len(zotero.get_papers())} papers "
             "in library"
@@ -60,6 +71,10 @@ def main(config_path: str = "config.yaml"):
                 f"  Using all {len(zotero.get_papers())} "
                 f"titles ({detailed} with abstracts)"
             )
+        if prefilter_config.get('enabled', False) and zotero.get_papers():
+            # Mean library embedding for the similarity pre-filter.
+            corpus_centroid = zotero.embed_corpus().mean(axis=0)
+            print("  Embedded library for the similarity pre-filter")
     else:
         print(
             "  No Zotero library found, "
@@ -109,12 +124,38 @@ def main(config_path: str = "config.yaml"):
     anthropic_config = config.get_anthropic_config()
     interests_config = config.get_interests()
 
+    # Evaluator diagnostics: per-paper errors at INFO and above, plus
+    # sample responses at DEBUG when verbose is on.
+    logging.getLogger("llm_evaluator").setLevel(
+        logging.DEBUG
+        if anthropic_config.get('verbose', False)
+        else logging.INFO
+    )
+    cache_config = config.get_cache_config()
+    cache_dir = (
+        cache_config.get('directory', '.cache')
+        if use_cache and cache_config.get('enabled', True)
+        else None
+    )
+
     evaluator = LLMEvaluator(
         api_key=anthropic_config['api_key'],
         model=anthropic_config.get('model', 'claude-haiku-4-5'),
         threshold=anthropic_config.get('threshold', 7.0),
         max_workers=anthropic_config.get('max_workers', 10),
-        verbose=anthropic_config.get('verbose', False)
+        use_batch_api=anthropic_config.get('use_batch_api', False),
+        batch_threshold=anthropic_config.get('batch_threshold', 1000),
+        batch_max_wait=anthropic_config.get('batch_max_wait', 7200),
+        cache_dir=cache_dir,
+        similarity_threshold=cache_config.get(
+            'similarity_threshold', 0.93
+        ),
+        requests_per_minute=anthropic_config.get('requests_per_minute'),
+        output_tokens_per_minute=anthropic_config.get(
+            'output_tokens_per_minute'
+        ),
+        prefilter_low=prefilter_config.get('low', 0.05),
+        prefilter_high=prefilter_config.get('high', 0.6)
     )
     
     user_interests = interests_config.get(
@@ -122,12 +163,22 @@ def main(config_path: str = "config.yaml"):
         ''
     )
     
+    async def evaluate():
+        # Close the pool on the same loop that opened it.
+        try:
+            return await evaluator.evaluate_papers(
+                papers=papers,
+                research_context=research_context,
+                user_interests=user_interests,
+                corpus_centroid=corpus_centroid,
+                top_k=anthropic_config.get('top_k'),
+                context_fingerprint=context_fingerprint
+            )
+        finally:
+            await evaluator.aclose()
+
     try:
-        relevant_papers, unscored_papers = evaluator.evaluate_papers(
-            papers=papers,
-            research_context=research_context,
-            user_interests=user_interests
-        )
+        relevant_papers, unscored_papers = asyncio.run(evaluate())
     except FatalEvaluationError as e:
         print("\n" + "=" * 70)
         print(f"FATAL: {e}")
@@ -176,10 +227,29 @@ def main(config_path: str = "config.yaml"):
 
 
 if __name__ == "__main__":
-    config_file = sys.argv[1] if len(
-        sys.argv
-    ) > 1 else "config.yaml"
+    arg_parser = argparse.ArgumentParser(
+        description="Run the ArXiv Weekly Digest"
+    )
+    arg_parser.add_argument(
+        "config",
+        nargs="?",
+        default="config.yaml",
+        help="Path to the YAML config (default: config.yaml)"
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Score every paper fresh; don't read or write the score cache"
+    )
+    args = arg_parser.parse_args()
+    
+    # Per-paper diagnostics from the evaluator go through logging
+    # (stderr, alongside tqdm) rather than print. Keep the root logger
+    # at WARNING so third-party INFO chatter (e.g. the HTTP client
+    # logging every request) doesn't flood the output; main() raises
+    # only the evaluator's logger.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
     
-    exit_code = main(config_file)
+    exit_code = main(args.config, use_cache=not args.no_cache)
     sys.exit(exit_code)
 
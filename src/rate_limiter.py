@@ -0,0 +1,58 @@
+"""
+Async token-bucket rate limiter for API calls
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every concurrent request on an event loop.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Callers wait until enough tokens are available, in arrival order, so
+    concurrent workers collectively stay under the limit instead of
+    bursting past it and retrying on 429s.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (the allowed burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        """Bucket allowing `limit` tokens per minute."""
+        return cls(rate=limit / 60.0, capacity=limit)
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until `amount` tokens are available, then take them."""
+        # A request larger than the bucket could never be satisfied.
+        amount = min(amount, self.capacity)
+
+        # Holding the lock while sleeping keeps waiters first-come,
+        # first-served.
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self._tokens) / self.rate)
@@ -0,0 +1,145 @@
+"""
+Persistent similarity cache for LLM relevance scores
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from embeddings import EMBEDDING_DIM, EMBEDDING_VERSION
+
+
+# Bump to invalidate every cached score (e.g. after a scoring-rubric
+# change that the prompt text alone doesn't capture).
+CACHE_VERSION = 1
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.93
+
+
+class SemanticCache:
+    """
+    Reuse scores for papers nearly identical to ones already scored.
+
+    Entries live in one namespace per (model, prompt prefix, embedding
+    scheme, cache version), so changing the model, the Zotero context,
+    the interests or the embedding scheme starts a fresh cache instead
+    of reusing scores that no longer apply.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        model: str,
+        prompt_prefix: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ):
+        """
+        Initialize the cache, loading any entries saved by earlier runs.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            model: Model whose scores are cached
+            prompt_prefix: Stable identity of the constant part of the
+                prompt (instructions, research context, interests)
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.threshold = threshold
+        key = hashlib.sha256(
+            f"{model}|{EMBEDDING_VERSION}|{CACHE_VERSION}|"
+            f"{prompt_prefix}".encode("utf-8")
+        ).hexdigest()[:16]
+        self._cache_dir = Path(cache_dir)
+        base = self._cache_dir / f"semantic-{key}"
+        self._vectors_file = base.with_suffix(".npy")
+        self._entries_file = base.with_suffix(".json")
+
+        self._entries = []
+        self._vectors = np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+        self._size = 0
+        self._dirty = False
+
+        if self._vectors_file.exists() and self._entries_file.exists():
+            try:
+                vectors = np.load(self._vectors_file)
+                with open(self._entries_file, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  Warning: ignoring unreadable score cache: {e}")
+            else:
+                if len(entries) == len(vectors):
+                    self._entries = entries
+                    self._vectors = vectors
+                    self._size = len(entries)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def lookup(self, vector: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for the nearest entry, if close enough.
+
+        Args:
+            vector: Unit-length embedding of the paper
+
+        Returns:
+            Dict with 'score' and 'reason', or None on a miss.
+        """
+        if not self._size:
+            return None
+
+        sims = self._vectors[:self._size] @ vector
+        best = int(np.argmax(sims))
+        if sims[best] >= self.threshold:
+            return self._entries[best]
+        return None
+
+    def add(self, vector: np.ndarray, score: float, reason: str) -> None:
+        """Record a freshly computed score."""
+        if self._size == len(self._vectors):
+            # Grow geometrically so adding N entries stays O(N).
+            grown = np.empty(
+                (max(64, 2 * len(self._vectors)), EMBEDDING_DIM),
+                dtype=np.float32
+            )
+            grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+
+        self._vectors[self._size] = vector
+        self._entries.append({'score': score, 'reason': reason})
+        self._size += 1
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist the cache if anything was added."""
+        self._remove_stale()
+        if not self._dirty:
+            return
+
+        self._vectors_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to temp files and rename, so an interrupted run can't
+        # leave a half-written cache behind.
+        tmp_vectors = self._vectors_file.with_name(
+            self._vectors_file.name + ".tmp"
+        )
+        tmp_entries = self._entries_file.with_name(
+            self._entries_file.name + ".tmp"
+        )
+        with open(tmp_vectors, 'wb') as f:
+            np.save(f, self._vectors[:self._size])
+        with open(tmp_entries, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_vectors, self._vectors_file)
+        os.replace(tmp_entries, self._entries_file)
+
+        self._dirty = False
+
+    def _remove_stale(self) -> None:
+        """Delete cache files from other namespaces (old model/context)."""
+        current = {self._vectors_file.name, self._entries_file.name}
+        for stale in self._cache_dir.glob("semantic-*"):
+            if stale.name not in current:
+                stale.unlink(missing_ok=True)
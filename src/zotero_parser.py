@@ -2,11 +2,37 @@
 Parser for Zotero library exports (BibTeX or JSON)
 """
 
-import json
+import hashlib
+import itertools
+import pickle
 import random
 import bibtexparser
+import numpy as np
+import orjson
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+from embeddings import (
+    EMBEDDING_DIM, EMBEDDING_VERSION, embed_texts, paper_text
+)
+
+
+# Bump whenever parsing changes what ends up in a paper dict, so cached
+# parses from older code are ignored.
+PARSE_CACHE_VERSION = 1
+
+
+def _format_authors(creators) -> str:
+    """Format Zotero creators as 'First Last, First Last'."""
+    return ', '.join([
+        f"{c.get('firstName', '')} {c['lastName']}"
+        for c in creators if 'lastName' in c
+    ])
+
+
+def _format_keywords(tags) -> str:
+    """Join a Zotero tag list; anything else yields no keywords."""
+    return ', '.join(tags) if isinstance(tags, list) else ''
 
 
 class ZoteroParser:
@@ -33,13 +59,47 @@ class ZoteroParser:
         """
         self.library_file = Path(library_file)
         self.papers = []
+        # self.papers[i] is entry self._file_order[i] of the export file.
+        self._file_order = []
 
         if self.library_file.exists():
-            self._parse_library()
+            self._load_or_parse_library()
 
+        self._file_order = list(range(len(self.papers)))
         if shuffle and self.papers:
-            random.Random(seed).shuffle(self.papers)
+            random.Random(seed).shuffle(self._file_order)
+            self.papers = [self.papers[i] for i in self._file_order]
     
+    def _load_or_parse_library(self) -> None:
+        """
+        Load a cached parse of the library, or parse and cache it.
+
+        bibtexparser is slow on large libraries, so the parsed papers are
+        pickled next to the library file, keyed by its mtime/size, and
+        reused until the file changes.
+        """
+        cache_file = self.library_file.with_name(
+            f"{self.library_file.name}.{self._signature()}."
+            f"v{PARSE_CACHE_VERSION}.papers.pkl"
+        )
+
+        if cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    self.papers = pickle.load(f)
+                return
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self.papers = []
+
+        self._parse_library()
+
+        self._remove_stale(cache_file, "papers.pkl")
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump(self.papers, f, pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"  Warning: could not cache parsed library: {e}")
+
     def _parse_library(self) -> None:
         """Parse the library file based on extension."""
         suffix = self.library_file.suffix.lower()
@@ -71,8 +131,9 @@ class ZoteroParser:
     
     def _parse_json(self) -> None:
         """Parse JSON export."""
-        with open(self.library_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # orjson parses large (100MB+) exports several times faster
+        # than the stdlib json module.
+        data = orjson.loads(self.library_file.read_bytes())
         
         # Handle different JSON structures from Zotero
         if isinstance(data, list):
@@ -82,36 +143,104 @@ class ZoteroParser:
         else:
             items = []
         
-        for item in items:
-            # Extract relevant fields
-            title = item.get('title', '')
-            abstract_note = item.get('abstractNote', '')
-            creators = item.get('creators', [])
-            
-            # Format authors
-            authors = ', '.join(
-                f"{c.get('firstName', '')} "
-                f"{c.get('lastName', '')}"
-                for c in creators if 'lastName' in c
-            )
-            
-            paper = {
-                'title': title,
-                'abstract': abstract_note,
-                'author': authors,
-                'year': item.get('date', '')[:4] 
-                if 'date' in item else '',
-                'keywords': ', '.join(
-                    item.get('tags', [])
-                ) if isinstance(
-                    item.get('tags'), list
-                ) else ''
+        # One comprehension with hoisted formatters keeps per-item
+        # overhead low on large (20k+ item) exports.
+        get = dict.get
+        self.papers.extend(
+            {
+                'title': get(item, 'title', ''),
+                'abstract': get(item, 'abstractNote', ''),
+                'author': _format_authors(get(item, 'creators', ())),
+                'year': item['date'][:4] if 'date' in item else '',
+                'keywords': _format_keywords(get(item, 'tags')),
             }
-            self.papers.append(paper)
+            for item in items
+        )
     
     def get_papers(self) -> List[Dict[str, str]]:
         """Get the list of parsed papers."""
         return self.papers
+
+    def fingerprint(self) -> str:
+        """
+        Order-independent hash of the library contents.
+
+        Unlike get_summary(), which follows the (shuffled) paper order,
+        this is identical across runs until papers are added or removed.
+        """
+        digest = hashlib.sha256()
+        for title in sorted(p.get('title', '') for p in self.papers):
+            digest.update(title.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def embed_corpus(self, batch_size: int = 256) -> np.ndarray:
+        """
+        Embed every paper's title + abstract.
+
+        The matrix is saved next to the library file, keyed by the
+        file's mtime/size and the embedding scheme, and memory-mapped
+        on later runs so re-opening an unchanged library is O(1).
+
+        Args:
+            batch_size: Papers embedded per chunk (bounds peak memory)
+
+        Returns:
+            (N, D) float32 array. Rows follow the export file's order,
+            not the (possibly shuffled) get_papers() order.
+        """
+        shape = (len(self.papers), EMBEDDING_DIM)
+        if not self.papers:
+            return np.empty(shape, dtype=np.float32)
+
+        cache_file = self._embeddings_file()
+
+        if cache_file.exists():
+            try:
+                embeddings = np.load(cache_file, mmap_mode='r')
+                if embeddings.shape == shape:
+                    return embeddings
+            except (OSError, ValueError):
+                pass
+
+        in_file_order = [None] * len(self.papers)
+        for paper, index in zip(self.papers, self._file_order):
+            in_file_order[index] = paper
+
+        embeddings = np.empty(shape, dtype=np.float32)
+        for start in range(0, len(in_file_order), batch_size):
+            chunk = in_file_order[start:start + batch_size]
+            embeddings[start:start + len(chunk)] = embed_texts(
+                [paper_text(p) for p in chunk]
+            )
+
+        self._remove_stale(cache_file, "emb.npy")
+        try:
+            np.save(cache_file, embeddings)
+        except OSError as e:
+            print(f"  Warning: could not save library embeddings: {e}")
+
+        return embeddings
+
+    def _embeddings_file(self) -> Path:
+        """Path of the saved embedding matrix for the current file."""
+        return self.library_file.with_name(
+            f"{self.library_file.name}.{self._signature()}."
+            f"{EMBEDDING_VERSION}.emb.npy"
+        )
+
+    def _signature(self) -> str:
+        """Cheap change-detection key for the library file."""
+        stat = self.library_file.stat()
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _remove_stale(self, current: Path, suffix: str) -> None:
+        """Delete cache files built from older versions of the library."""
+        for stale in current.parent.glob(
+            f"{self.library_file.name}.*.{suffix}"
+        ):
+            if stale != current:
+                stale.unlink(missing_ok=True)
     
     def get_summary(
         self, 
@@ -131,52 +260,51 @@ class ZoteroParser:
         if not self.papers:
             return "No Zotero library provided."
         
-        summary_lines = [
+        sections = [[
             f"Research Background from Zotero library "
             f"({len(self.papers)} papers):",
             ""
-        ]
+        ]]
         
         # Section 1: A sample of papers with abstracts (mixed across
         # topics when shuffling is enabled).
         if detailed_papers > 0:
-            summary_lines.extend([
+            sections.append([
                 f"Papers with details "
                 f"(a sample of {detailed_papers} across topics):",
                 ""
             ])
-            
-            papers_with_abstracts = self.papers[:detailed_papers]
-            
-            for i, paper in enumerate(papers_with_abstracts, 1):
-                title = paper.get('title', 'No title')
-                abstract = paper.get('abstract', '')
-                
-                # Truncate very long abstracts
-                if len(abstract) > 200:
-                    abstract = abstract[:200] + "..."
-                
-                summary_lines.append(f"{i}. {title}")
-                if abstract:
-                    summary_lines.append(
-                        f"   Abstract: {abstract}"
-                    )
-                summary_lines.append("")
+            sections.append(
+                self._detailed_lines(self.papers[:detailed_papers])
+            )
         
         # Section 2: All remaining titles (compact)
         if include_all_titles and len(self.papers) > detailed_papers:
-            summary_lines.extend([
+            sections.append([
                 "",
                 f"Additional papers in library "
                 f"({len(self.papers) - detailed_papers} more):",
                 ""
             ])
-            
-            remaining_papers = self.papers[detailed_papers:]
-            for paper in remaining_papers:
-                title = paper.get('title', 'No title')
-                # Just titles, very compact
-                summary_lines.append(f"- {title}")
+            # Just titles, very compact
+            sections.append(
+                f"- {paper.get('title', 'No title')}"
+                for paper in self.papers[detailed_papers:]
+            )
         
-        return "\n".join(summary_lines)
+        # Lines are generated lazily and joined in a single pass.
+        return "\n".join(itertools.chain.from_iterable(sections))
+
+    @staticmethod
+    def _detailed_lines(papers: List[Dict[str, str]]) -> Iterator[str]:
+        """Yield the numbered title/abstract lines for detailed papers."""
+        for i, paper in enumerate(papers, 1):
+            yield f"{i}. {paper.get('title', 'No title')}"
+            abstract = paper.get('abstract', '')
+            if abstract:
+                # Truncate very long abstracts
+                if len(abstract) > 200:
+                    abstract = abstract[:200] + "..."
+                yield f"   Abstract: {abstract}"
+            yield ""
 